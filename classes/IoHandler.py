@@ -182,12 +182,14 @@ class IoHandler:
     # Waveshare UPS battery percentage handler
     @classmethod
     def get_ups_battery_reading(cls) -> Tuple[float, float]:
-        cls.ups_battery_remaining = (cls.ups.bus_voltage - 3) / 1.18 * 100
+        # read the bus voltage once - it is used for the percentage and returned as is
+        cls.ups_voltage = cls.ups.bus_voltage
+        cls.ups_battery_remaining = (cls.ups_voltage - 3) / 1.18 * 100
         if cls.ups_battery_remaining < 0:
             cls.ups_battery_remaining = 0
         elif cls.ups_battery_remaining > 100:
             cls.ups_battery_remaining = 100
         # print("Percent:  {:6.1f} %".format(cls.ups_battery_remaining))
-        return (cls.ups_battery_remaining, cls.ups.bus_voltage)
+        return (cls.ups_battery_remaining, cls.ups_voltage)
 
     # """
@@ -3,9 +3,58 @@ from classes.ResponseBuilder import ResponseBuilder
 from classes.IoHandler import IoHandler
 
 import gc
+import struct
+import utime
 
 
 class RequestHandler:
+    # response objects allocated once and updated in place by every request
+    # (serialized before the next await, so handlers never see them half-filled)
+    imu_response = {
+        "status": "OK",
+        "acceleration": {"X": 0.0, "Y": 0.0, "Z": 0.0},
+        "gyro": {"X": 0.0, "Y": 0.0, "Z": 0.0},
+        "magnetic": {"X": 0.0, "Y": 0.0, "Z": 0.0},
+    }
+    battery_response = {
+        "status": "OK",
+        "battery_voltage": 0.0,
+        "battery_current": 0.0,
+        "battery_percentage": 0.0,
+    }
+    # receive buffer reused by every request instead of allocating a new one per read
+    # (decoded by RequestParser before the next await, so it is never shared)
+    request_buffer = bytearray(1024)
+    # sliced to the received length without copying the bytes
+    request_view = memoryview(request_buffer)
+    # binary IMU reading: accel XYZ, gyro XYZ, magnetic XYZ as little-endian float32
+    imu_bin_format = "<9f"
+    # packed into this buffer in place instead of allocating a new bytes object
+    imu_bin_buffer = bytearray(struct.calcsize(imu_bin_format))
+    # binary snapshot of every sensor in one response: ticks_ms timestamp,
+    # Waveshare IMU (9 floats), Adafruit IMU (9 floats), battery V / A / %
+    # the timestamp is sent as uint32 but wraps with the ticks period (2**30 ms,
+    # ~12.4 days on the RP2040) - take deltas as (b - a) & 0x3FFFFFFF
+    all_bin_format = "<I18f3f"
+    all_bin_buffer = bytearray(struct.calcsize(all_bin_format))
+
+    # IMU readers, in response order: acceleration, gyro, magnetic
+    imu_keys = ("acceleration", "gyro", "magnetic")
+    ada_imu_readers = (
+        IoHandler.get_accel_ada_reading,
+        IoHandler.get_gyro_ada_reading,
+        IoHandler.get_magnetic_ada_reading,
+    )
+    wav_imu_readers = (
+        IoHandler.get_accel_wav_reading,
+        IoHandler.get_gyro_wav_reading,
+        IoHandler.get_magnetic_wav_reading,
+    )
+
+    # api action => (handler, its extra args) - filled in below the class body,
+    # once the handler classmethods exist
+    api_actions = {}
+
     def __init__(self) -> None:
         # get everything into a starting state
         gc.enable()
@@ -16,10 +65,14 @@ class RequestHandler:
     @classmethod
     async def handle_request(cls, reader, writer) -> None:
         try:
-            raw_request = await reader.read(1024)
+            n = await reader.readinto(cls.request_buffer)
+            if not n:
+                # client closed without sending a request - nothing to parse or answer
+                await writer.wait_closed()
+                return
             gc.collect()
 
-            request = RequestParser(raw_request)
+            request = RequestParser(cls.request_view[:n])
 
             response_builder = ResponseBuilder()
 
@@ -27,99 +80,12 @@ class RequestHandler:
             if request.url_match("/api"):
                 action = request.get_action()
                 gc.collect()
-                if action == "AdaReadIMU":
-                    # ajax request for data
-                    acceleration = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    gyro = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    magnetic = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    acceleration["X"], acceleration["Y"], acceleration["Z"] = (
-                        IoHandler.get_accel_ada_reading()
-                    )
-                    gc.collect()
-                    gyro["X"], gyro["Y"], gyro["Z"] = IoHandler.get_gyro_ada_reading()
-                    gc.collect()
-                    magnetic["X"], magnetic["Y"], magnetic["Z"] = (
-                        IoHandler.get_magnetic_ada_reading()
-                    )
-                    gc.collect()
-                    response_obj = {
-                        "status": "OK",
-                        "acceleration": acceleration,
-                        "gyro": gyro,
-                        "magnetic": magnetic,
-                    }
-                    response_builder.set_body_from_dict(response_obj)
-                elif action == "WavReadIMU":
-                    # ajax request for data
-                    acceleration = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    gyro = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    magnetic = {
-                        "X": 0.0,
-                        "Y": 0.0,
-                        "Z": 0.0,
-                    }
-                    acceleration["X"], acceleration["Y"], acceleration["Z"] = (
-                        IoHandler.get_accel_wav_reading()
-                    )
-                    gc.collect()
-                    gyro["X"], gyro["Y"], gyro["Z"] = IoHandler.get_gyro_wav_reading()
-                    gc.collect()
-                    magnetic["X"], magnetic["Y"], magnetic["Z"] = (
-                        IoHandler.get_magnetic_wav_reading()
-                    )
-                    gc.collect()
-                    response_obj = {
-                        "status": "OK",
-                        "acceleration": acceleration,
-                        "gyro": gyro,
-                        "magnetic": magnetic,
-                    }
-                    response_builder.set_body_from_dict(response_obj)
-                elif action == "getBatteryInfo":
-                    battery_percentage, battery_voltage = (
-                        IoHandler.get_ups_battery_reading()
-                    )
-                    gc.collect()
-                    battery_current = IoHandler.get_ups_current_reading()
-                    gc.collect()
-                    response_obj = {
-                        "status": "OK",
-                        "battery_voltage": battery_voltage,
-                        "battery_current": battery_current,
-                        "battery_percentage": battery_percentage,
-                    }
-                    response_builder.set_body_from_dict(response_obj)
-                # elif action == "getPressureInfo":
-                #     pressure = IoHandler.get_pressure_wav_reading()
-                #     gc.collect()
-                #     temperature = IoHandler.get_temp_wav_reading()
-                #     gc.collect()
-                #     response_obj = {
-                #         "status": "OK",
-                #         "pressure": pressure,
-                #         "temperature": temperature,
-                #     }
-                #     response_builder.set_body_from_dict(response_obj)
+                # action comes straight from the request data and may be any
+                # JSON value - only strings can name an action (lists/dicts are
+                # unhashable and would break the lookup)
+                if isinstance(action, str) and action in cls.api_actions:
+                    handler, handler_args = cls.api_actions[action]
+                    handler(response_builder, *handler_args)
                 else:
                     # unknown action
                     response_builder.set_status(404)
@@ -131,8 +97,97 @@ class RequestHandler:
             response_builder.build_response()
             writer.write(response_builder.response)
             await writer.drain()
+            if response_builder.file_path:
+                await response_builder.send_file(writer)
             await writer.wait_closed()
             gc.collect()
 
         except OSError as e:
             print("connection error " + str(e.errno) + " " + str(e))
+
+    # IMU handler (shared by both sensors)
+    @classmethod
+    def read_imu(cls, response_builder: ResponseBuilder, imu_readers: tuple) -> None:
+        # ajax request for data
+        response_obj = cls.imu_response
+        for key, read in zip(cls.imu_keys, imu_readers):
+            xyz = response_obj[key]
+            xyz["X"], xyz["Y"], xyz["Z"] = read()
+            gc.collect()
+        response_builder.set_body_from_dict(response_obj)
+
+    # IMU binary handler (shared by both sensors)
+    @classmethod
+    def read_imu_bin(
+        cls, response_builder: ResponseBuilder, imu_readers: tuple
+    ) -> None:
+        # same reading as the JSON handler, packed as 36 bytes of raw floats
+        reading = cls.read_imu_values(imu_readers)
+        struct.pack_into(cls.imu_bin_format, cls.imu_bin_buffer, 0, *reading)
+        response_builder.set_body_from_bytes(cls.imu_bin_buffer)
+
+    # all sensors binary handler - one round trip instead of one per sensor
+    @classmethod
+    def read_all_sensors_bin(cls, response_builder: ResponseBuilder) -> None:
+        timestamp = utime.ticks_ms()
+        wav_reading = cls.read_imu_values(cls.wav_imu_readers)
+        ada_reading = cls.read_imu_values(cls.ada_imu_readers)
+        battery_percentage, battery_voltage = IoHandler.get_ups_battery_reading()
+        battery_current = IoHandler.get_ups_current_reading()
+        reading = (
+            (timestamp,)
+            + wav_reading
+            + ada_reading
+            + (battery_voltage, battery_current, battery_percentage)
+        )
+        struct.pack_into(cls.all_bin_format, cls.all_bin_buffer, 0, *reading)
+        response_builder.set_body_from_bytes(cls.all_bin_buffer)
+
+    # flat (accel XYZ, gyro XYZ, magnetic XYZ) reading of one IMU
+    @classmethod
+    def read_imu_values(cls, imu_readers: tuple) -> tuple:
+        read_accel, read_gyro, read_magnetic = imu_readers
+        return read_accel() + read_gyro() + read_magnetic()
+
+    # Waveshare UPS handler
+    @classmethod
+    def read_battery_info(cls, response_builder: ResponseBuilder) -> None:
+        battery_percentage, battery_voltage = IoHandler.get_ups_battery_reading()
+        gc.collect()
+        battery_current = IoHandler.get_ups_current_reading()
+        gc.collect()
+        response_obj = cls.battery_response
+        response_obj["battery_voltage"] = battery_voltage
+        response_obj["battery_current"] = battery_current
+        response_obj["battery_percentage"] = battery_percentage
+        response_builder.set_body_from_dict(response_obj)
+
+    """
+    # Waveshare pressure handler
+    @classmethod
+    def read_pressure_info(cls, response_builder: ResponseBuilder) -> None:
+        pressure = IoHandler.get_pressure_wav_reading()
+        gc.collect()
+        temperature = IoHandler.get_temp_wav_reading()
+        gc.collect()
+        response_obj = {
+            "status": "OK",
+            "pressure": pressure,
+            "temperature": temperature,
+        }
+        response_builder.set_body_from_dict(response_obj)
+    """
+
+
+# api action => (classmethod that fills in the response, its extra args)
+# (one dict lookup instead of comparing the action against every name; holds the
+# handlers themselves, so a renamed handler fails at import, not on a request)
+RequestHandler.api_actions = {
+    "AdaReadIMU": (RequestHandler.read_imu, (RequestHandler.ada_imu_readers,)),
+    "WavReadIMU": (RequestHandler.read_imu, (RequestHandler.wav_imu_readers,)),
+    "AdaReadIMUBin": (RequestHandler.read_imu_bin, (RequestHandler.ada_imu_readers,)),
+    "WavReadIMUBin": (RequestHandler.read_imu_bin, (RequestHandler.wav_imu_readers,)),
+    "getBatteryInfo": (RequestHandler.read_battery_info, ()),
+    "ReadAllSensorsBin": (RequestHandler.read_all_sensors_bin, ()),
+    # "getPressureInfo": (RequestHandler.read_pressure_info, ()),
+}
@@ -9,11 +9,15 @@ except ImportError:
 
 
 class RequestParser:
+    # regular expressions compiled once instead of on every call
+    form_name_regex = re.compile(r"name=\"([^\"]+)")
+    space_regex = re.compile(r"%20")
+    newline_regex = re.compile(r"%0A")
 
     def __init__(self, raw_request) -> None:
-        # make sure raw_request is a str
-        if isinstance(raw_request, bytes):
-            raw_request = raw_request.decode("utf-8")
+        # make sure raw_request is a str (accepts bytes or any other buffer)
+        if not isinstance(raw_request, str):
+            raw_request = str(raw_request, "utf-8")
         self.method = ""
         self.full_url = ""
         self.url = ""
@@ -133,15 +137,15 @@ class RequestParser:
     def parse_header_line(
         self, header_line: str
     ) -> Tuple[bool, bool] | Tuple[str, str]:
-        # split header line on : to get name and value
-        line_parts = header_line.split(":")
-        # should be two parts
-        if len(line_parts) != 2:
+        # find the first : to get name and value - index directly instead of
+        # splitting the whole line, so values containing : (Host: ip:port) are kept
+        colon = header_line.find(":")
+        if colon == -1:
             return (False, False)
         else:
             # strip leading and trailing spaces
-            header_name = line_parts[0].strip()
-            header_value = line_parts[1].strip()
+            header_name = header_line[:colon].strip()
+            header_value = header_line[colon + 1 :].strip()
             # return as tuple
             return (header_name, header_value)
 
@@ -201,7 +205,7 @@ class RequestParser:
             # line num points at content-disposition line
             # extract name of variable - note does not handle arrays!
             # uses regular expression - learn how to use these!!
-            match = re.search(r"name=\"([^\"]+)", self.content[line_num])
+            match = self.__class__.form_name_regex.search(self.content[line_num])
             # move pointer to next line
             line_num += 1
             try:
@@ -273,8 +277,8 @@ class RequestParser:
     def unquote(self, url_string: str) -> str:
         # replaces %20 with space
         # %0A with newline
-        url_string = re.sub(r"%20", " ", url_string)
-        url_string = re.sub(r"%0A", "\n", url_string)
+        url_string = self.__class__.space_regex.sub(" ", url_string)
+        url_string = self.__class__.newline_regex.sub("\n", url_string)
         return url_string
 
     # return relevant data set depending on request method
@@ -12,6 +12,32 @@ except ImportError:
 class ResponseBuilder:
     protocol = "HTTP/1.1"
     server = "Pi Pico MicroPython"
+    # status line and headers, built once - only the variable parts are formatted
+    head_template = (
+        protocol + " %d %s\r\n"
+        "Server: " + server + "\r\n"
+        "Content-Type: %s\r\n"
+        "Content-Length: %d\r\n"
+        "Connection: Closed\r\n"
+        "\r\n"
+    )
+    # reason phrases, built once instead of on every response
+    status_messages = {
+        200: "OK",
+        400: "Bad Request",
+        403: "Forbidden",
+        404: "Not Found",
+        500: "Internal Server Error",
+    }
+    # file extension => content type of served static files
+    content_types = {
+        "htm": "text/html",
+        "html": "text/html",
+        "js": "text/javascript",
+        "css": "text/css",
+    }
+    # static files are sent to the client in chunks of this size
+    file_chunk_size = 512
 
     def __init__(self) -> None:
         # set default values
@@ -19,6 +45,9 @@ class ResponseBuilder:
         self.content_type = "text/html"
         self.body = ""
         self.response = ""
+        # static file streamed after the response head (see send_file)
+        self.file_path = ""
+        self.file_size = 0
         gc.enable()
 
     def set_content_type(self, content_type: str) -> None:
@@ -48,32 +77,32 @@ class ResponseBuilder:
         # break filename into path and filename
         gc.collect()
         path, filename = req_filename.rsplit("/", 1)
-        # reinstate root path for listdir
-        if len(path) == 0:
-            path = "/"
         # print(path, filename)
         # make sure working from root directory
         os.chdir("/")
-        # check if file exists
-        if filename in os.listdir(path):
+        # check if file exists - a single stat instead of listing the whole
+        # directory and then looking the file up again to open it
+        file_path = "{}/{}".format(path, filename)
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            file_stat = None
+        # skip directories (stat mode S_IFDIR)
+        if file_stat is not None and not file_stat[0] & 0x4000:
             # file found
             # get file type
-            _, file_type = filename.rsplit(".", 1)
-            if file_type == "htm" or file_type == "html":
-                self.content_type = "text/html"
-            elif file_type == "js":
-                self.content_type = "text/javascript"
-            elif file_type == "css":
-                self.content_type = "text/css"
-            else:
-                # let browser work it out
-                self.content_type = "text/html"
+            file_type = filename.rsplit(".", 1)[-1]
+            # unknown type - let browser work it out
+            self.content_type = self.__class__.content_types.get(
+                file_type, "text/html"
+            )
             gc.collect()
             # file = open("{}/{}".format(path, filename))
             # self.set_body(file.read())
-            with open("{}/{}".format(path, filename)) as f:
-                self.set_body(f.read())
             # self.set_body(open("{}/{}".format(path, filename)).read())
+            # don't read the file into memory - it is streamed by send_file
+            self.file_path = file_path
+            self.file_size = file_stat[6]
             gc.collect()
             self.set_status(200)
             gc.collect()
@@ -85,36 +114,42 @@ class ResponseBuilder:
         self.body = json.dumps(dictionary)
         self.set_content_type("application/json")
 
+    def set_body_from_bytes(
+        self, data: bytes | bytearray, content_type: str = "application/octet-stream"
+    ) -> None:
+        self.body = data
+        self.set_content_type(content_type)
+
     def build_response(self) -> None:
         gc.collect()
-        self.response = ""
-        # status line
-        self.response += (
-            self.__class__.protocol
-            + " "
-            + str(self.status)
-            + " "
-            + self.get_status_message()
-            + "\r\n"
+        # status line + headers in one pass over the cached template
+        self.response = self.__class__.head_template % (
+            self.status,
+            self.get_status_message(),
+            self.content_type,
+            self.file_size if self.file_path else len(self.body),
         )
-        # Headers
-        self.response += "Server: " + self.server + "\r\n"
-        self.response += "Content-Type: " + self.content_type + "\r\n"
-        self.response += "Content-Length: " + str(len(self.body)) + "\r\n"
-        self.response += "Connection: Closed\r\n"
-        self.response += "\r\n"
         # body
-        if len(self.body) > 0:
+        if not isinstance(self.body, str):
+            # binary body (bytes / bytearray) - send the whole response as bytes
+            self.response = self.response.encode() + self.body
+        elif len(self.body) > 0:
             self.response += self.body
 
+    async def send_file(self, writer) -> None:
+        # write the static file to the client chunk by chunk,
+        # so it never has to fit in memory as a whole
+        buffer = bytearray(self.__class__.file_chunk_size)
+        with open(self.file_path, "rb") as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                writer.write(buffer if n == len(buffer) else buffer[:n])
+                await writer.drain()
+
     def get_status_message(self) -> str:
-        status_messages = {
-            200: "OK",
-            400: "Bad Request",
-            403: "Forbidden",
-            404: "Not Found",
-            500: "Internal Server Error",
-        }
+        status_messages = self.__class__.status_messages
         if self.status in status_messages:
             return status_messages[self.status]
         else:
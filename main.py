@@ -6,6 +6,7 @@ import uasyncio as asyncio
 # import _thread
 import machine
 import gc
+import utime
 
 from classes.WiFiConnection import WiFiConnection
 from classes.RequestHandler import RequestHandler
@@ -17,23 +18,35 @@ gc.collect()
 if not WiFiConnection.start_ap_mode():
     raise RuntimeError("Setting up Access Point failed")
 
+# housekeeping (gc + free memory report) period in ms
+HOUSEKEEPING_INTERVAL_MS = 5000
+
 
 async def main() -> None:
-    handler = RequestHandler()
-    asyncio.create_task(asyncio.start_server(handler.handle_request, "0.0.0.0", 80))
+    # handle_request is a classmethod - no handler instance needed
+    asyncio.create_task(
+        asyncio.start_server(RequestHandler.handle_request, "0.0.0.0", 80)
+    )
     # asyncio.create_task/(
     #     asyncio.start_server(RequestHandler().handle_request, "0.0.0.0", 80)
     # )
     gc.collect()
-    counter = 0
+    # run housekeeping on a fixed-rate schedule (monotonic ticks_ms deadlines),
+    # not on a loop-iteration count, so it does not depend on server load
+    next_housekeeping = utime.ticks_add(utime.ticks_ms(), HOUSEKEEPING_INTERVAL_MS)
     while True:
-        # if counter % 1000 == 0:
-        if counter == 1000:
-            gc.collect()
-            print(gc.mem_free())
-            counter = 0
-        counter += 1
-        await asyncio.sleep(0)
+        # block until the deadline instead of spinning on sleep(0) -
+        # the scheduler can idle in poll() and wake only for client sockets
+        await asyncio.sleep_ms(
+            max(0, utime.ticks_diff(next_housekeeping, utime.ticks_ms()))
+        )
+        gc.collect()
+        print(gc.mem_free())
+        next_housekeeping = utime.ticks_add(next_housekeeping, HOUSEKEEPING_INTERVAL_MS)
+        now = utime.ticks_ms()
+        if utime.ticks_diff(now, next_housekeeping) >= 0:
+            # fell behind by more than a period - resync instead of bursting
+            next_housekeeping = utime.ticks_add(now, HOUSEKEEPING_INTERVAL_MS)
 
 
 if __name__ == "__main__":